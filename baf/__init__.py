@@ -1,35 +1,73 @@
+import functools
 import json
 import tomllib
+from collections.abc import Callable
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Any
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .datatypes import *
 from .datatypes import _Primitive
 
-root_path: Path
+root_path_var: ContextVar[Path] = ContextVar('root_path')
 """The root directory of the data file used to build the current tree. This is
    safe to access from setter methods to get additional files in the relative
-   path."""
+   path. Being a ContextVar, separate threads can build different files at the
+   same time."""
+
+
+def __getattr__(name: str) -> Any:
+    # baf.root_path reads the root path of the build in the current context
+    if name == 'root_path':
+        try:
+            return root_path_var.get()
+        except LookupError:
+            raise AttributeError(f"module {__name__!r} has no attribute 'root_path' outside of a build") from None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def build_json(root_type: type[Block], path: Path | str) -> Block:
     """Builds a JSON file into a Block of the provided type."""
-    global root_path
-    root_path = Path(path).parent.absolute()
-    with open(path, 'rb') as f:
-        data = json.load(f)
-    return build(root_type, data)
+    data = _loads_json(Path(path).read_bytes())
+    return build(root_type, data, Path(path).parent)
+
+
+def _loads_json(raw: bytes) -> Any:
+    # orjson is an optional dependency; it parses large inputs much faster
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects some input json accepts (a BOM, UTF-16, NaN), so
+            # let json decide whether the file is valid
+            pass
+    return json.loads(raw)
 
 
 def build_toml(root_type: type[Block], path: Path | str) -> Block:
     """Builds a TOML file into a Block of the provided type."""
-    global root_path
-    root_path = Path(path).parent.absolute()
     with open(path, 'rb') as f:
         data = tomllib.load(f)
-    return build(root_type, data)
+    return build(root_type, data, Path(path).parent)
+
 
+def build(root_type: type[Block], data: dict, root_path: Path | str | None = None) -> Block:
+    """Builds a dict into a Block of the provided type. If given, root_path is
+       used as baf.root_path during the build, e.g. to resolve relative File
+       paths."""
+    if root_path is None:
+        return _build(root_type, data)
+    token = root_path_var.set(Path(root_path).absolute())
+    try:
+        return _build(root_type, data)
+    finally:
+        root_path_var.reset(token)
 
-def build(root_type: type[Block], data: dict) -> Block:
-    """Builds a dict into a Block of the provided type."""
+
+def _build(root_type: type[Block], data: dict) -> Block:
     root_item = root_type().instantiate(None)
     root_item.build(data)
     return root_item
@@ -42,7 +80,7 @@ def visualize(block: Block) -> str:
 
 
 def _visualize(block: Array | Block, indent: int = 0, offset: int = 0) -> str:
-    out_string = ''
+    lines = []
     if isinstance(block, Array):
         items = [('', elem) for elem in block.get_items()]
     else:
@@ -50,30 +88,56 @@ def _visualize(block: Array | Block, indent: int = 0, offset: int = 0) -> str:
     for name, item in items:
         if not item:
             continue
-        out_string += _print_item(item, name, indent, offset)
-        if isinstance(item, Array) or isinstance(item, Block):
-            out_string += _visualize(item, indent + 1, item.offset() + offset)
-    return out_string
-
-
-def _print_item(item: DatatypeBase, name: str, indent: int, offset: int) -> str:
-    type_name = type(item).__name__
-    if isinstance(item, Array):
-        type_name += f"[{type(item._model).__name__}] ({len(item)})"
-    elif isinstance(item, Optional):
-        type_name += f"[{type(item.model).__name__}]"
+        lines.append(_printer_for(type(item))(item, name, indent, offset))
+    return ''.join(lines)
+
+
+def _print_item(item: DatatypeBase, name: str, indent: int, offset: int, type_name: str | None = None) -> str:
+    if type_name is None:
+        type_name = type(item).__name__
     if name:
-        type_name = f"{name}: {type_name}"
-    f_indent = ' ' * indent * 2
-    f_global_offset = hex(item.offset() + offset)
-    f_size = hex(item.size())
-    out_string = ''
+        return f"{_indent(indent)}{item.offset() + offset:#x} ({item.size():#x}) {name}: {type_name}\n"
+    return f"{_indent(indent)}{item.offset() + offset:#x} ({item.size():#x}) {type_name}\n"
+
+
+def _print_array(item: Array, name: str, indent: int, offset: int) -> str:
+    type_name = f"{type(item).__name__}[{type(item._model).__name__}] ({len(item)})"
+    out_string = _print_item(item, name, indent, offset, type_name)
+    offset += item.offset()
     # If drawing an array of primitives, collapse into '...'
-    if isinstance(item, _Primitive) and isinstance(item.parent, Array):
-        if item.parent.get_items()[0] is item:
-            out_string = f"{f_indent}{f_global_offset} ..."
-    else:
-        out_string = f"{f_indent}{f_global_offset} ({f_size}) {type_name}"
-    if out_string:
-        out_string += '\n'
-    return out_string
+    if isinstance(item._model, _Primitive):
+        return out_string + f"{_indent(indent + 1)}{offset:#x} ...\n"
+    return out_string + _visualize(item, indent + 1, offset)
+
+
+def _print_block(item: Block, name: str, indent: int, offset: int) -> str:
+    out_string = _print_item(item, name, indent, offset)
+    return out_string + _visualize(item, indent + 1, item.offset() + offset)
+
+
+def _print_optional(item: Optional, name: str, indent: int, offset: int) -> str:
+    type_name = f"{type(item).__name__}[{type(item.model).__name__}]"
+    return _print_item(item, name, indent, offset, type_name)
+
+
+@functools.cache
+def _indent(indent: int) -> str:
+    return ' ' * indent * 2
+
+
+_PRINTERS: dict[type, Callable[[Any, str, int, int], str]] = {
+    Array: _print_array,
+    Block: _print_block,
+    Optional: _print_optional,
+}
+"""Printers for datatypes that need more than a single line."""
+
+
+@functools.cache
+def _printer_for(cls: type) -> Callable[[Any, str, int, int], str]:
+    """Gets the printer for a datatype, using the closest base class found in
+       _PRINTERS."""
+    for base in cls.__mro__:
+        if (printer := _PRINTERS.get(base)) is not None:
+            return printer
+    return _print_item
@@ -4,21 +4,43 @@ from typing import Any, ClassVar, Self, Sequence, TypeVar
 from collections.abc import Callable
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-import copy
+from collections import deque
+import inspect
+import struct
 from pathlib import Path
+try:
+    import numpy as np
+except ImportError:
+    np = None
 import baf
 from .errors import *
 
 class DatatypeBase[T: DatatypeBase](ABC):
     """The abstract base class of all BAF datatypes."""
 
-    parent: Container | None = None
+    __slots__ = ('parent', '_is_instance', '_is_built', '_is_done', '_generic_type', '__orig_class__')
+
+    parent: Container | None
     """The parent datum of this datum."""
-    _is_instance: bool = False
+    _is_instance: bool
     """Whether this is an instantiated datum (if not, it is a model)."""
-    _is_built: bool = False
+    _is_built: bool
     """Whether this datum has been built."""
-    _generic_type: T | None = None
+    _is_done: bool
+    """Whether this datum has finished building. Unlike _is_built, this is
+       False while the build is still in progress."""
+    _generic_type: T | None
+    _defaults: ClassVar[dict[str, Any]] = {'parent': None, '_is_instance': False, '_is_built': False, '_is_done': False, '_generic_type': None}
+    """Initial values of the slots, including those inherited. Subclasses that
+       declare slots extend this."""
+
+    def __new__(cls, *args, **kwargs) -> Self:
+        # Set in __new__ rather than __init__, so subclasses whose __init__
+        # doesn't call super().__init__() still have every slot initialized
+        datum = super().__new__(cls)
+        for name, value in cls._defaults.items():
+            setattr(datum, name, value)
+        return datum
 
     @property
     def root_datum(self) -> DatatypeBase:
@@ -39,6 +61,7 @@ class DatatypeBase[T: DatatypeBase](ABC):
             raise BuildError("Attempted to build an already-built datum")
         self._is_built = True
         self._build(data)
+        self._is_done = True
 
     @abstractmethod
     def _build(self, data: Any, /) -> None:
@@ -46,16 +69,46 @@ class DatatypeBase[T: DatatypeBase](ABC):
 
     def get_bytes(self) -> bytes:
         """Outputs this datum in its final form of raw bytes."""
+        self._check_gettable()
+        return self._write_all(self._write_into)
+
+    def _write_all(self, write: Callable[[bytearray, int], int]) -> bytes:
+        # size() is cached once built, so the whole output is allocated once
+        out = bytearray(self.size())
+        if write(out, 0) != len(out):
+            raise InternalError(f"Output of {type(self).__name__} does not match its size()")
+        return bytes(out)
+
+    def _check_gettable(self) -> None:
         if not self._is_instance:
             raise BuildError("Attempted to get bytes from a non-instantiated model")
         if not self._is_built:
             raise BuildError("Attempted to get bytes from a datum that has not yet been built")
-        return self._get_bytes()
 
     @abstractmethod
     def _get_bytes(self) -> bytes:
         ...
 
+    def _write_into(self, out: bytearray, offset: int) -> int:
+        """Writes the output of this datum into out at the given offset and
+           returns the number of bytes written. Datatypes can override this to
+           avoid creating intermediate bytes objects."""
+        return self._replace_slot(out, offset, self._get_bytes())
+
+    def _replace_slot(self, out: bytearray, offset: int, data: bytes) -> int:
+        # Overridden output may not match size(); replacing the size() bytes
+        # reserved for this datum shifts the rest, like concatenating would
+        out[offset:offset + self.size()] = data
+        return len(data)
+
+    def _write_child_into(self, out: bytearray, offset: int) -> int:
+        """Writes this datum as part of its parent's output. If get_bytes() is
+           overridden, its output is used, as it would be for the root."""
+        if type(self).get_bytes is not DatatypeBase.get_bytes:
+            return self._replace_slot(out, offset, self.get_bytes())
+        self._check_gettable()
+        return self._write_into(out, offset)
+
     @abstractmethod
     def size(self) -> int:
         """Gets the total size, in bytes, of this datum."""
@@ -69,14 +122,34 @@ class DatatypeBase[T: DatatypeBase](ABC):
             return 0
         return self.parent.offset_of(self)
 
+    def _clone(self) -> Self:
+        """Creates a shallow copy of this datum. Subclasses extend this to copy
+           any attributes they add."""
+
+        # Every slot is copied below, so the defaults from __new__ are skipped
+        datum = object.__new__(type(self))
+        datum.parent = self.parent
+        datum._is_instance = self._is_instance
+        datum._is_built = self._is_built
+        datum._is_done = self._is_done
+        datum._generic_type = self._generic_type
+        if (orig := getattr(self, '__orig_class__', None)) is not None:
+            datum.__orig_class__ = orig
+        # Blocks and user-defined subclasses keep attributes in a __dict__
+        if attrs := getattr(self, '__dict__', None):
+            datum.__dict__.update(attrs)
+        return datum
+
     def instantiate(self, parent: Container | None) -> Self:
         """Instantiates a datum from this model."""
 
         if self._is_built:
             raise BuildError("Attempted to instantiate from a datum that is building or already built")
-        datum = copy.copy(self)
-        if orig := getattr(datum, '__orig_class__', None):
-            datum._generic_type = typing.get_args(orig)[0]
+        datum = self._clone()
+        # Resolve the type argument once on the model, so datums inherit it
+        # through _clone() instead of each inspecting __orig_class__
+        if self._generic_type is None and (orig := getattr(self, '__orig_class__', None)):
+            self._generic_type = datum._generic_type = typing.get_args(orig)[0]
         # If type argument is TypeVar (T), we're inheriting from a generic
         # parent, so get that type instead
         if type(datum._generic_type) is TypeVar:
@@ -91,10 +164,19 @@ class DatatypeBase[T: DatatypeBase](ABC):
 class Datatype[T](DatatypeBase, ABC):
     """The base class for standard datatypes that are built from input data."""
 
-    _default_value: T | None = None
+    __slots__ = ('_default_value',)
+
+    _default_value: T | None
+    _defaults = DatatypeBase._defaults | {'_default_value': None}
 
     def __init__(self, *, default: T | None = None) -> None:
         self._default_value = default
+        super().__init__()
+
+    def _clone(self) -> Self:
+        datum = super()._clone()
+        datum._default_value = self._default_value
+        return datum
 
     @abstractmethod
     def _process(self, data: Any) -> None:
@@ -116,6 +198,8 @@ class GenDatatype(DatatypeBase, ABC):
     """The base class for datatypes that generate their own data when built,
        without the need for input data."""
 
+    __slots__ = ()
+
     def _build(self, _: None = None) -> None:
         self.preprocess()
         self._preprocess()
@@ -136,8 +220,19 @@ class Container[T](Datatype, ABC):
        Their output is the combined output of all datums in their
        collection."""
 
-    def __init__(self, *, default: T | None = None) -> None:
-        super().__init__(default=default)
+    __slots__ = ('_offsets', '_cached_size')
+
+    _offsets: dict[int, int] | None
+    """Offsets of each item by id(), cached once the Container is done."""
+    _cached_size: int | None
+    """Total size, cached once the Container is done."""
+    _defaults = Datatype._defaults | {'_offsets': None, '_cached_size': None}
+
+    def _clone(self) -> Self:
+        datum = super()._clone()
+        datum._offsets = None
+        datum._cached_size = None
+        return datum
 
     @abstractmethod
     def get_items(self, default_if_missing: bool = False) -> Sequence[DatatypeBase]:
@@ -150,9 +245,21 @@ class Container[T](Datatype, ABC):
         ...
 
     def size(self) -> int:
-        return sum(item.size() for item in self.get_items(True))
+        if self._cached_size is not None:
+            return self._cached_size
+        size = sum(item.size() for item in self.get_items(True))
+        if self._is_done:
+            self._cached_size = size
+        return size
 
     def offset_of(self, target: DatatypeBase) -> int:
+        # Item sizes can't change once built, so compute every offset once
+        if self._is_done:
+            if self._offsets is None:
+                self._offsets = self._item_offsets()
+            if (offset := self._offsets.get(id(target))) is not None:
+                return offset
+            raise InternalError("Could not find self in parent")
         offset = 0
         for item in self.get_items(True):
             if item is target:
@@ -160,8 +267,29 @@ class Container[T](Datatype, ABC):
             offset += item.size()
         raise InternalError("Could not find self in parent")
 
+    def _item_offsets(self) -> dict[int, int]:
+        offsets = {}
+        offset = 0
+        for item in self.get_items():
+            offsets.setdefault(id(item), offset)
+            offset += item.size()
+        self._cached_size = offset
+        return offsets
+
     def _get_bytes(self) -> bytes:
-        return b''.join([item.get_bytes() for item in self.get_items()])
+        return self._write_all(self._write_items)
+
+    def _write_into(self, out: bytearray, offset: int) -> int:
+        # Subclasses that override _get_bytes() are written through it
+        if type(self)._get_bytes is not Container._get_bytes:
+            return super()._write_into(out, offset)
+        return self._write_items(out, offset)
+
+    def _write_items(self, out: bytearray, offset: int) -> int:
+        start = offset
+        for item in self.get_items():
+            offset += item._write_child_into(out, offset)
+        return offset - start
 
     def _unpack_type(self, model: DatatypeBase, data: Any) -> tuple[DatatypeBase, Any]:
         """The user can declare a field as a more generic type (e.g. Block) and
@@ -186,13 +314,39 @@ class Container[T](Datatype, ABC):
         return True
 
 
+# Unsigned struct format codes by byte size; lowercase gives the signed code
+_STRUCT_CODES = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
 class _Primitive(Datatype[int], ABC):
     """The base class of all primitive integer datatypes."""
 
+    __slots__ = ('_data',)
+
     _bit_size: ClassVar[int]
+    _byte_size: ClassVar[int]
     _min: ClassVar[int]
     _max: ClassVar[int]
-    _data: int | None = None
+    _packer: ClassVar[struct.Struct | None] = None
+    """Packs unsigned values, if struct has a code for this size."""
+    _signed_packer: ClassVar[struct.Struct | None] = None
+    _data: int | None
+    _defaults = Datatype._defaults | {'_data': None}
+
+    def _clone(self) -> Self:
+        datum = super()._clone()
+        datum._data = self._data
+        return datum
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Resolved once per class so the build path doesn't recompute it
+        if hasattr(cls, '_bit_size'):
+            cls._byte_size = cls._bit_size // 8
+            # Other sizes (e.g. 24-bit) are packed with int.to_bytes() instead
+            if (code := _STRUCT_CODES.get(cls._byte_size)) is not None:
+                cls._packer = struct.Struct('>' + code)
+                cls._signed_packer = struct.Struct('>' + code.lower())
 
     def _process(self, data: int) -> None:
         self._data = data
@@ -200,33 +354,50 @@ class _Primitive(Datatype[int], ABC):
     def _preprocess(self, data) -> int:
         if type(data) is not int:
             raise ValidationError(f"Expected int, received {type(data).__name__}")
-        if data < self._min or data > self._max:
+        if not self._min <= data <= self._max:
             raise ValidationError(f"Value {data} outside of {type(self).__name__} range, must be {self._min} to {self._max}")
         return data
 
     def size(self) -> int:
-        return self._bit_size // 8
+        return self._byte_size
 
     @classmethod
     def static_size(cls) -> int:
         """Gets the statically-known size of this class."""
 
-        return cls._bit_size // 8
+        return cls._byte_size
 
     def _get_bytes(self) -> bytes:
-        if self._data is None:
+        if (data := self._data) is None:
             raise BuildError("Primitive does not yet have a value")
-        return self._data.to_bytes(self.size(), signed=self._data < 0)
+        if self._packer is None:
+            return data.to_bytes(self._byte_size, signed=data < 0)
+        if data < 0:
+            return self._signed_packer.pack(data)
+        return self._packer.pack(data)
+
+    def _write_into(self, out: bytearray, offset: int) -> int:
+        if type(self)._get_bytes is not _Primitive._get_bytes or self._packer is None:
+            return super()._write_into(out, offset)
+        if (data := self._data) is None:
+            raise BuildError("Primitive does not yet have a value")
+        if data < 0:
+            self._signed_packer.pack_into(out, offset, data)
+        else:
+            self._packer.pack_into(out, offset, data)
+        return self._byte_size
 
     def __int__(self) -> int:
         if self._data is None:
-            raise DependencyError("Primitive does not yet have a value")
+            raise DependencyError("Primitive does not yet have a value", blocker=self)
         return self._data
 
 
 class U8(_Primitive):
     """Datatype for 8-bit unsigned integers. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 8
     _min = 0
     _max = 2 ** 8 - 1
@@ -235,6 +406,8 @@ class U8(_Primitive):
 class U16(_Primitive):
     """Datatype for 16-bit unsigned integers. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 16
     _min = 0
     _max = 2 ** 16 - 1
@@ -243,6 +416,8 @@ class U16(_Primitive):
 class U32(_Primitive):
     """Datatype for 32-bit unsigned integers. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 32
     _min = 0
     _max = 2 ** 32 - 1
@@ -251,6 +426,8 @@ class U32(_Primitive):
 class S8(_Primitive):
     """Datatype for 8-bit signed integers."""
 
+    __slots__ = ()
+
     _bit_size = 8
     _min = -2 ** 8 // 2
     _max = 2 ** 8 // 2 - 1
@@ -259,6 +436,8 @@ class S8(_Primitive):
 class S16(_Primitive):
     """Datatype for 16-bit signed integers. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 16
     _min = -2 ** 16 // 2
     _max = 2 ** 16 // 2 - 1
@@ -267,6 +446,8 @@ class S16(_Primitive):
 class S32(_Primitive):
     """Datatype for 32-bit signed integers. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 32
     _min = -2 ** 32 // 2
     _max = 2 ** 32 // 2 - 1
@@ -276,6 +457,8 @@ class I8(_Primitive):
     """Datatype for 8-bit integers which can ambiguously be signed or
        unsigned. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 8
     _min = S8._min
     _max = U8._max
@@ -285,6 +468,8 @@ class I16(_Primitive):
     """Datatype for 16-bit integers which can ambiguously be signed or
        unsigned. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 16
     _min = S16._min
     _max = U16._max
@@ -294,6 +479,8 @@ class I32(_Primitive):
     """Datatype for 32-bit integers which can ambiguously be signed or
        unsigned. Supports int() conversion."""
 
+    __slots__ = ()
+
     _bit_size = 32
     _min = S32._min
     _max = U32._max
@@ -302,13 +489,21 @@ class I32(_Primitive):
 class Bytes(Datatype[bytes]):
     """Datatype for a sequence of raw bytes."""
 
-    _size: int | None = None
+    __slots__ = ('_size', '_data')
+
+    _size: int | None
     _data: bytes
+    _defaults = Datatype._defaults | {'_size': None}
 
     def __init__(self, size: int | None = None, *, default: bytes | None = None) -> None:
         self._size = size
         super().__init__(default=default)
 
+    def _clone(self) -> Self:
+        datum = super()._clone()
+        datum._size = self._size
+        return datum
+
     def _process(self, data: bytes) -> None:
         self._data = data
 
@@ -325,17 +520,25 @@ class Bytes(Datatype[bytes]):
         if self._size is not None:
             return self._size
         if not hasattr(self, '_data'):
-            raise DependencyError("Size of Bytes is not yet known")
+            raise DependencyError("Size of Bytes is not yet known", blocker=self)
         return len(self._data)
 
     def _get_bytes(self) -> bytes:
         return self._data
 
+    def _write_into(self, out: bytearray, offset: int) -> int:
+        if type(self)._get_bytes is not Bytes._get_bytes:
+            return super()._write_into(out, offset)
+        out[offset:offset + len(self._data)] = self._data
+        return len(self._data)
+
 
 class File(Datatype[str]):
     """Datatype that accepts a file path and outputs the raw bytes of that
        file."""
 
+    __slots__ = ('_data',)
+
     _data: bytes
 
     def _process(self, data: bytes) -> None:
@@ -347,7 +550,14 @@ class File(Datatype[str]):
         except TypeError:
             raise ValidationError(f"File datatype expected PathLike or str, received {type(data).__name__}")
         if not path.is_absolute():
-            path = baf.root_path/path
+            try:
+                root_path = baf.root_path_var.get()
+            except LookupError:
+                # Outside build_json()/build_toml(), a root path may still have
+                # been assigned to baf.root_path directly
+                if (root_path := vars(baf).get('root_path')) is None:
+                    raise ValidationError(f"Relative File path {path} needs a root path; use an absolute path or pass root_path to build()") from None
+            path = Path(root_path)/path
         if not Path.exists(path):
             raise ValidationError(f"File does not exist: {path}")
         with open(path, 'rb') as f:
@@ -355,14 +565,31 @@ class File(Datatype[str]):
 
     def size(self) -> int:
         if not hasattr(self, '_data'):
-            raise DependencyError("Size of File is not yet known")
+            raise DependencyError("Size of File is not yet known", blocker=self)
         return len(self._data)
 
     def _get_bytes(self) -> bytes:
         return self._data
 
+    def _write_into(self, out: bytearray, offset: int) -> int:
+        if type(self)._get_bytes is not File._get_bytes:
+            return super()._write_into(out, offset)
+        out[offset:offset + len(self._data)] = self._data
+        return len(self._data)
+
+
+def depends_on(*names: str) -> Callable[[Callable], Callable]:
+    """Decorator that declares which fields a Block setter depends on. The
+       Block builds those fields before calling the setter, instead of
+       discovering the dependency when the setter fails."""
 
-@dataclass
+    def decorator(setter: Callable) -> Callable:
+        setter._baf_dependencies = names
+        return setter
+    return decorator
+
+
+@dataclass(slots=True)
 class _BlockItem:
     name: str
     model: DatatypeBase
@@ -391,47 +618,152 @@ class Block(Container[dict], ABC):
     """The base class for most user-defined datatypes. It builds data based on
        its class attributes."""
 
+    # Blocks store their fields as instance attributes, so unlike other
+    # datatypes they don't declare __slots__
+
+    @classmethod
+    def _setters(cls) -> dict[str, Any]:
+        """Gets the unbound set_<name> attribute of each field that has a
+           setter on the class."""
+        # Cached per class like _fields(). This happens on first use, so
+        # setters added after the class body (e.g. by a decorator) are found.
+        if '_setter_cache' not in cls.__dict__:
+            setters = {}
+            for name in cls._fields():
+                try:
+                    setters[name] = inspect.getattr_static(cls, 'set_' + name)
+                except AttributeError:
+                    continue
+            cls._setter_cache = setters
+        return cls._setter_cache
+
+    @classmethod
+    def _dependencies(cls) -> dict[str, tuple[str, ...]]:
+        """Gets the fields each setter declared with @depends_on."""
+        if '_dependency_cache' not in cls.__dict__:
+            fields = cls._fields()
+            dependencies = {}
+            for name, setter in cls._setters().items():
+                # Setters are unbound, so look through staticmethod and
+                # classmethod to the function @depends_on decorated
+                if not hasattr(setter, '_baf_dependencies'):
+                    setter = getattr(setter, '__func__', setter)
+                if names := getattr(setter, '_baf_dependencies', ()):
+                    for dependency in names:
+                        if dependency not in fields:
+                            raise SpecError(f"{cls.__name__}.set_{name} depends on unknown field {dependency}")
+                    dependencies[name] = names
+            cls._dependency_cache = dependencies
+        return cls._dependency_cache
+
+    @classmethod
+    def _build_order(cls) -> tuple[str, ...]:
+        """Gets the field names sorted so declared dependencies are built
+           first."""
+        if '_build_order_cache' not in cls.__dict__:
+            cls._build_order_cache = cls._sort_fields()
+        return cls._build_order_cache
+
+    @classmethod
+    def _sort_fields(cls) -> tuple[str, ...]:
+        """Topologically sorts the fields by their declared dependencies,
+           otherwise keeping them in declaration order."""
+        dependencies = cls._dependencies()
+        order = []
+        placed = set()
+        remaining = list(cls._fields())
+        while remaining:
+            for name in remaining:
+                if placed.issuperset(dependencies.get(name, ())):
+                    break
+            else:
+                raise SpecError(f"Cyclical dependencies declared in {cls.__name__}: {', '.join(remaining)}")
+            remaining.remove(name)
+            order.append(name)
+            placed.add(name)
+        return tuple(order)
+
     # Instantiate empty datatypes with a parent so offset() works more reliably
     # in setters
     def __init__(self, *, default: dict | None = None) -> None:
+        super().__init__(default=default)
         for name, model in self._fields().items():
             setattr(self, name, model.instantiate(self))
-        super().__init__(default=default)
 
     def _process(self, data: dict) -> None:
         blockitems = [_BlockItem(name, model, data) for name, model in self._fields().items()]
-        for item in blockitems:
-            item.setter = getattr(self, 'set_' + item.name, None)
+        blockitems_by_name = {item.name: item for item in blockitems}
+        setters = self._setters()
         for item in blockitems:
             name, model = item.name, item.model
+            # Setters assigned on the instance (e.g. in preprocess()) are used
+            # as-is; class setters are bound like getattr() would
+            if (setter := self.__dict__.get('set_' + name)) is not None:
+                item.setter = setter
+            elif (setter := setters.get(name)) is not None:
+                item.setter = setter.__get__(self, type(self)) if hasattr(setter, '__get__') else setter
             # Check if this field is in dict data
             if name in data:
                 item.data = data[name]
             # Check for default value
             elif isinstance(model, Datatype) and model._default_value is not None:
                 item.data = model._default_value
-        # Build blocks until all dependencies are resolved
-        while any(not blockitem.done for blockitem in blockitems):
+        # Build blocks until all dependencies are resolved. Items blocked on a
+        # known sibling wait for it to finish; others are retried every pass.
+        # Declared dependencies are built first, so those setters don't fail.
+        pending = [blockitems_by_name[name] for name in self._build_order()]
+        dependencies = self._dependencies()
+        waiters: dict[str, list[_BlockItem]] = {}
+        while pending or waiters:
             progress = False
-            for item in blockitems:
-                if item.done:
-                    continue
+            retry = []
+            queue = deque(pending)
+            while queue:
+                item = queue.popleft()
+                if item.name in dependencies:
+                    blocker = next((name for name in dependencies[item.name] if not blockitems_by_name[name].done), None)
+                    if blocker is not None:
+                        waiters.setdefault(blocker, []).append(item)
+                        continue
                 try:
                     item.build(self)
-                except DependencyError:
+                except DependencyError as e:
+                    blocker = self._blocking_field(e.blocker)
+                    if blocker is None or blocker == item.name or blockitems_by_name[blocker].done:
+                        retry.append(item)
+                    else:
+                        waiters.setdefault(blocker, []).append(item)
                     continue
                 except Exception as e:
                     e.add_note(f'{type(self).__name__} -> {item.name}: {type(item.model).__name__}')
                     raise
                 progress = True
+                queue.extend(waiters.pop(item.name, ()))
             # If nothing got resolved in a full pass, cyclical dependencies
             if not progress:
                 raise BuildError("Could not resolve dependencies. Check for cyclical dependencies in: "
                     f"{', '.join([item.name for item in blockitems if not item.done])}")
+            pending = retry
+
+    def _blocking_field(self, blocker: object | None) -> str | None:
+        """Gets the name of the field in this Block that contains the given
+           datum, or None if it isn't found."""
+        # Unbuilt fields are placeholders shared with the model, so their
+        # parent isn't this Block; match the field attributes by identity
+        fields = {id(getattr(self, name, None)): name for name in self._fields()}
+        node = blocker
+        while isinstance(node, DatatypeBase) and node is not self:
+            if (name := fields.get(id(node))) is not None:
+                return name
+            node = node.parent
+        return None
 
     @classmethod
     def _fields(cls) -> dict[str, DatatypeBase]:
-        return {k:v for (k, v) in cls.__dict__.items() if not k.startswith('_') and isinstance(v, DatatypeBase)}
+        # Class bodies don't change after definition, so cache per class
+        if '_field_cache' not in cls.__dict__:
+            cls._field_cache = {k:v for (k, v) in cls.__dict__.items() if not k.startswith('_') and isinstance(v, DatatypeBase)}
+        return cls._field_cache
 
     def _preprocess(self, data) -> dict:
         if type(data) is not dict:
@@ -439,7 +771,7 @@ class Block(Container[dict], ABC):
         for name, model in self._fields().items():
             if isinstance(model, GenDatatype | Optional) or isinstance(model, Datatype) and model._default_value is not None:
                 continue
-            if name in data or hasattr(self, 'set_' + name):
+            if name in data or name in self._setters() or 'set_' + name in self.__dict__:
                 continue
             raise ValidationError(f"No setter or dict value found for {name}")
         return data
@@ -454,7 +786,7 @@ class Block(Container[dict], ABC):
            that the current setter does not build until the forced dependency
            does."""
         if not model._is_built:
-            raise DependencyError(f"Forced dependency: Model is not yet built")
+            raise DependencyError(f"Forced dependency: Model is not yet built", blocker=model)
 
     @classmethod
     def static_size(cls) -> int:
@@ -464,22 +796,44 @@ class Block(Container[dict], ABC):
         return sum(item.size() for item in cls._fields().values())
         
 
+# Methods a primitive subclass must not override for Array to store its
+# elements in _values
+_PRIMITIVE_HOOKS = ('preprocess', '_preprocess', '_process', 'size', 'get_bytes', '_get_bytes', '_write_into')
+
+
 class Array[T: DatatypeBase](Container[Sequence[T]]):
     """Datatype for an array of other datatypes. If known, the item count can
        optionally be specified. This object supports len() but does not
        otherwise behave like a Python list type. Use get_items() to get a list
        of items."""
 
+    __slots__ = ('_model', '_item_count', '_items', '_values', '_filler')
+
     _model: T | None
     _item_count: int | None
-    _items: list[T]
+    _items: Sequence[T]
+    _values: Any | None
+    """For arrays of primitives, a numpy array holding every element's value,
+       used instead of building a datum per element. For 8-bit primitives built
+       from bytes, this is a memoryview of those bytes instead."""
+    _filler: T | None
+    """A default datum that stands in for items not yet built."""
+    _defaults = Container._defaults | {'_model': None, '_item_count': None, '_items': (), '_values': None, '_filler': None}
 
     def __init__(self, model: T | None = None, item_count: int | None = None, *, default: Sequence[T] | None = None) -> None:
         self._model = model
         self._item_count = item_count
-        self._items = []
         super().__init__(default=default)
 
+    def _clone(self) -> Self:
+        datum = super()._clone()
+        datum._model = self._model
+        datum._item_count = self._item_count
+        datum._items = ()
+        datum._values = None
+        datum._filler = None
+        return datum
+
     def _preprocess(self, data) -> Sequence:
         if self._model is None:
             if self._generic_type is None:
@@ -501,34 +855,131 @@ class Array[T: DatatypeBase](Container[Sequence[T]]):
     def _process(self, data: Sequence) -> None:
         if self._model is None:
             raise InternalError("Array still has no inferred type in _process()")
+        if self._process_values(data):
+            return
         items = []
+        # Loop-invariant lookups, hoisted since arrays can be very long
+        array_model = self._model
+        model_type = type(array_model)
+        unpack_type = self._unpack_type
         for i, data_item in enumerate(data):
             # Check if passing in an already-built item
-            if isinstance(data_item, type(self._model)):
+            if isinstance(data_item, model_type):
                 items.append(data_item)
                 continue
-            model, data_item = self._unpack_type(self._model, data_item)
+            model, data_item = unpack_type(array_model, data_item)
             item = model.instantiate(self)
             items.append(item)
             try:
                 item.build(data_item)
             except Exception as e:
-                e.add_note(f'Array[{type(self._model).__name__}] -> (element {i})')
+                e.add_note(f'Array[{model_type.__name__}] -> (element {i})')
                 raise
         self._items = items
 
+    def _process_values(self, data: Sequence) -> bool:
+        """Stores an array of plain primitives as a single numpy array (or
+           bytes, for 8-bit primitives). Returns False if the data isn't
+           eligible, in which case the array is built one datum at a time."""
+        model = self._model
+        if not data or not isinstance(model, _Primitive):
+            return False
+        # Custom primitives may transform their data or output, so build those
+        # normally
+        model_type = type(model)
+        if any(getattr(model_type, name) is not getattr(_Primitive, name) for name in _PRIMITIVE_HOOKS):
+            return False
+        # Bytes are already in output form for 8-bit primitives. min() and max()
+        # scan them in C, and are skipped if every byte value is in range.
+        if (type(data) is bytes or type(data) is bytearray) and model.size() == 1:
+            if model._min > 0 or model._max < 0xff:
+                if min(data) < model._min or max(data) > model._max:
+                    return False
+            self._values = memoryview(bytes(data))
+            return True
+        if np is None:
+            return False
+        # Signed and ambiguous types need a dtype that holds every valid value
+        if model._min >= 0:
+            kind, size = 'u', model.size()
+        elif model._max < 2 ** (model._bit_size - 1):
+            kind, size = 'i', model.size()
+        else:
+            kind, size = 'i', model.size() * 2
+        # numpy only has 1, 2, 4 and 8-byte integers
+        if size not in (1, 2, 4, 8):
+            return False
+        if not all(type(value) is int for value in data):
+            return False
+        try:
+            values = np.fromiter(data, dtype=np.int64, count=len(data))
+        except OverflowError:
+            return False
+        # Out-of-range data is left for the regular build to report, so the
+        # error points at the offending element
+        if values.min() < model._min or values.max() > model._max:
+            return False
+        self._values = values.astype(f'>{kind}{size}')
+        return True
+
+    def _unpack_values(self) -> list[T]:
+        """Builds a datum for each element stored in _values."""
+        if self._model is None:
+            raise InternalError("Array still has no inferred type in _unpack_values()")
+        items = []
+        for value in self._values.tolist():
+            item = self._model.instantiate(self)
+            item.build(value)
+            items.append(item)
+        return items
+
+    def size(self) -> int:
+        if (size := self._static_size()) is not None:
+            return size
+        return super().size()
+
+    def static_size(self) -> int:
+        """Gets the statically-known size of this Array. This requires the
+           item count to be specified and the items to be primitives."""
+
+        if (size := self._static_size()) is None:
+            raise DependencyError("Array does not have a statically-known size", blocker=self)
+        return size
+
+    def _static_size(self) -> int | None:
+        # Primitives have a static size, so no element datums are needed
+        if self._item_count is None or not isinstance(self._model, _Primitive):
+            return None
+        return self._item_count * type(self._model).static_size()
+
+    def _write_items(self, out: bytearray, offset: int) -> int:
+        if (values := self._values) is None:
+            return super()._write_items(out, offset)
+        if not isinstance(values, memoryview):
+            # Casting to unsigned wraps negative values to two's complement
+            values = values.astype(f'>u{self._model.size()}', copy=False).data
+        out[offset:offset + values.nbytes] = values
+        return values.nbytes
+
     def get_items(self, default_if_missing: bool = False) -> list[T]:
+        # Element datums for _values are only built once they're asked for
+        if self._values is not None and not self._items:
+            self._items = self._unpack_values()
         items = [item for item in self._items]
         if self._item_count is None and not items:
-            raise DependencyError("Cannot get items of un-built Array with unknown size")
+            raise DependencyError("Cannot get items of un-built Array with unknown size", blocker=self)
         if self._item_count is None:
             return items
         items_left = self._item_count - len(items)
         if items_left > 0 and not default_if_missing:
-            raise DependencyError("Array is not finished building")
+            raise DependencyError("Array is not finished building", blocker=self)
         if self._model is None:
             raise InternalError("Array still has no inferred type in get_items()")
-        return items + [self._model.instantiate(self)] * items_left
+        if items_left <= 0:
+            return items
+        if self._filler is None:
+            self._filler = self._model.instantiate(self)
+        return items + [self._filler] * items_left
 
     def __len__(self) -> int:
         if self._item_count is not None:
@@ -544,13 +995,22 @@ class Optional[T: Datatype](DatatypeBase):
        been confirmed to receive data, and False if it has resolved to not
        receive data."""
 
-    _item: T | None = None
+    __slots__ = ('_item', 'model')
+
+    _item: T | None
     model: T
+    _defaults = DatatypeBase._defaults | {'_item': None}
 
     def __init__(self, model: T) -> None:
         self.model = model
         super().__init__()
 
+    def _clone(self) -> Self:
+        datum = super()._clone()
+        datum.model = self.model
+        datum._item = self._item
+        return datum
+
     def _build(self, data: Any | None) -> None:
         self._preprocess(data)
         if data is None or isinstance(data, Sequence) and len(data) == 0:
@@ -565,15 +1025,22 @@ class Optional[T: Datatype](DatatypeBase):
 
     def size(self) -> int:
         if not self._is_built:
-            raise DependencyError("Cannot get size of Optional before it's built")
+            raise DependencyError("Cannot get size of Optional before it's built", blocker=self)
         return self._item.size() if self._item else 0
 
     def _get_bytes(self) -> bytes:
         return self._item.get_bytes() if self._item else bytes(0)
 
+    def _write_into(self, out: bytearray, offset: int) -> int:
+        if type(self)._get_bytes is not Optional._get_bytes:
+            return super()._write_into(out, offset)
+        if not self._item:
+            return 0
+        return self._item._write_child_into(out, offset)
+
     def __bool__(self) -> bool:
         if not self._is_built:
-            raise DependencyError("Optional is ambiguous until it is built")
+            raise DependencyError("Optional is ambiguous until it is built", blocker=self)
         return self._item is not None
 
 
@@ -584,14 +1051,24 @@ class Align(GenDatatype):
        is already aligned, no padding will be added, and this object will have
        a size and output of 0 bytes."""
 
+    __slots__ = ('_align_size', '_pad_amount')
+
     _align_size: int
-    _pad_amount: int | None = None
+    _pad_amount: int | None
+    _defaults = GenDatatype._defaults | {'_pad_amount': None}
 
     def __init__(self, align_size: int | DatatypeBase) -> None:
         if isinstance(align_size, DatatypeBase):
             self._align_size = align_size.size()
         else:
             self._align_size = align_size
+        super().__init__()
+
+    def _clone(self) -> Self:
+        datum = super()._clone()
+        datum._align_size = self._align_size
+        datum._pad_amount = self._pad_amount
+        return datum
 
     def _preprocess(self) -> None:
         if self._align_size < 2:
@@ -606,6 +1083,8 @@ class Align(GenDatatype):
         return bytes(self._pad_amount)
 
     def size(self) -> int:
+        if self._pad_amount is not None:
+            return self._pad_amount
         align = self._align_size
         pad_amount = (align - self.offset() % align) % align
         return pad_amount
@@ -33,5 +33,11 @@ class DependencyError(BAFError):
        can succeed. For example, attempting size() on a datum without a
        statically-known size will raise a DependencyError until the datum has
        been built."""
-    pass
+
+    blocker: object | None
+    """The datum that needs to be built first, if known."""
+
+    def __init__(self, *args, blocker: object | None = None) -> None:
+        super().__init__(*args)
+        self.blocker = blocker
 
@@ -0,0 +1,122 @@
+import functools
+import unittest
+import baf
+from baf.datatypes import *
+
+
+def make_chain(length: int, calls: list[str]) -> type[Block]:
+    """Creates a Block where each field's setter reads the next field, so the
+       fields can only be built in reverse declaration order."""
+    namespace = {}
+    for i in range(length):
+        name = f'f{i}'
+        namespace[name] = U8()
+        if i < length - 1:
+            def setter(self, _, name=name, next_name=f'f{i + 1}'):
+                calls.append(name)
+                return int(getattr(self, next_name))
+            namespace['set_' + name] = setter
+    return type('Chain', (Block,), namespace)
+
+
+class TestDependencyResolution(unittest.TestCase):
+
+    def test_blocked_setters_wait_for_sibling(self):
+        calls = []
+        length = 200
+        chain = make_chain(length, calls)
+        block = baf.build(chain, {f'f{length - 1}': 7})
+        self.assertEqual(block.get_bytes(), bytes([7] * length))
+        # Each setter fails once on its unbuilt sibling, then succeeds once
+        # that sibling is built, instead of being retried every pass
+        self.assertLessEqual(len(calls), 2 * (length - 1))
+
+    def test_cyclical_dependencies(self):
+        class Cycle(Block):
+            a = U8()
+            b = U8()
+
+            def set_a(self, _):
+                return int(self.b)
+
+            def set_b(self, _):
+                return int(self.a)
+
+        with self.assertRaises(BuildError):
+            baf.build(Cycle, {})
+
+    def test_declared_dependencies_on_wrapped_setters(self):
+        class Wrapped(Block):
+            x = U8()
+            y = U8()
+            a = U8()
+
+            @staticmethod
+            @depends_on('a')
+            def set_x(_):
+                return 1
+
+            @classmethod
+            @depends_on('a')
+            def set_y(cls, _):
+                return 2
+
+        self.assertEqual(Wrapped._build_order(), ('a', 'x', 'y'))
+        self.assertEqual(baf.build(Wrapped, {'a': 3}).get_bytes(), bytes([1, 2, 3]))
+
+
+class TestSetters(unittest.TestCase):
+
+    def test_setter_kinds(self):
+        class Base(Block):
+            def set_d(self, _):
+                return 4
+
+        class Setters(Base):
+            a = U8()
+            b = U8()
+            c = U8()
+            d = U8()
+            set_a = functools.partial(lambda value, _: value, 1)
+
+            @staticmethod
+            def set_b(_):
+                return 2
+
+            @classmethod
+            def set_c(cls, _):
+                return 3
+
+        self.assertEqual(baf.build(Setters, {}).get_bytes(), bytes([1, 2, 3, 4]))
+
+    def test_setters_added_after_class_body(self):
+        def add_setter(cls):
+            cls.set_a = lambda self, _: 1
+            return cls
+
+        @add_setter
+        class Late(Block):
+            a = U8()
+            b = U8()
+            c = U8()
+
+            def preprocess(self, data):
+                self.set_b = lambda _: 2
+                return data
+
+        Late.set_c = lambda self, _: 3
+        self.assertEqual(baf.build(Late, {}).get_bytes(), bytes([1, 2, 3]))
+
+
+class TestFile(unittest.TestCase):
+
+    def test_relative_path_without_root(self):
+        class Assets(Block):
+            data = File()
+
+        with self.assertRaises(ValidationError):
+            baf.build(Assets, {'data': 'relative.bin'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from pathlib import Path
+import baf
+from baf.datatypes import *
+
+
+class Pair(Block):
+    a = U8()
+    b = U16()
+
+
+class TestBuildJson(unittest.TestCase):
+
+    def build_text(self, text: str, encoding: str) -> Block:
+        with tempfile.TemporaryDirectory() as root:
+            path = Path(root)/'data.json'
+            path.write_text(text, encoding=encoding)
+            return baf.build_json(Pair, path)
+
+    def test_byte_order_mark(self):
+        block = self.build_text('{"a": 1, "b": 2}', 'utf-8-sig')
+        self.assertEqual(block.get_bytes(), bytes([1, 0, 2]))
+
+    def test_utf16(self):
+        block = self.build_text('{"a": 1, "b": 2}', 'utf-16')
+        self.assertEqual(block.get_bytes(), bytes([1, 0, 2]))
+
+
+
+class Assets(Block):
+    data = File()
+
+
+class TestRootPath(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        (self.root/'asset.bin').write_bytes(b'\x01\x02')
+
+    def test_build_parameter(self):
+        block = baf.build(Assets, {'data': 'asset.bin'}, self.root)
+        self.assertEqual(block.get_bytes(), b'\x01\x02')
+
+    def test_module_attribute(self):
+        baf.root_path = self.root
+        try:
+            block = baf.build(Assets, {'data': 'asset.bin'})
+        finally:
+            del baf.root_path
+        self.assertEqual(block.get_bytes(), b'\x01\x02')
+
+if __name__ == '__main__':
+    unittest.main()
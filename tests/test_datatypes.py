@@ -0,0 +1,177 @@
+import unittest
+from unittest import mock
+import baf
+from baf import datatypes
+from baf.datatypes import *
+from baf.datatypes import _Primitive
+
+
+class U24(_Primitive):
+    _bit_size = 24
+    _min = 0
+    _max = 2 ** 24 - 1
+
+
+class S24(_Primitive):
+    _bit_size = 24
+    _min = -2 ** 24 // 2
+    _max = 2 ** 24 // 2 - 1
+
+
+class TestPrimitive(unittest.TestCase):
+
+    def test_custom_size(self):
+        class Custom(Block):
+            a = U24()
+            b = S24()
+
+        block = baf.build(Custom, {'a': 0x123456, 'b': -2})
+        self.assertEqual(block.get_bytes(), bytes.fromhex('123456fffffe'))
+
+    def test_custom_size_array(self):
+        class I64(_Primitive):
+            _bit_size = 64
+            _min = -2 ** 63
+            _max = 2 ** 64 - 1
+
+        class Custom(Block):
+            a = Array(U24())
+            b = Array(I64())
+
+        block = baf.build(Custom, {'a': [1, 2], 'b': [1, -1]})
+        self.assertEqual(block.get_bytes(), bytes.fromhex('000001000002' '0000000000000001' 'ffffffffffffffff'))
+
+
+def expected_bytes(model: type[_Primitive], values: list[int]) -> bytes:
+    return b''.join(value.to_bytes(model.static_size(), signed=value < 0) for value in values)
+
+
+class TestArray(unittest.TestCase):
+
+    cases = {
+        U8: [0, 1, 0x7f, 0xff],
+        U16: [0, 1, 0x1234, 0xffff],
+        U32: [0, 1, 0x12345678, 0xffffffff],
+        S8: [-0x80, -1, 0, 0x7f],
+        S16: [-0x8000, -1, 0, 0x7fff],
+        S32: [-0x80000000, -1, 0, 0x7fffffff],
+        I8: [-0x80, -1, 0, 0xff],
+        I16: [-0x8000, -1, 0, 0xffff],
+        I32: [-0x80000000, -1, 0, 0xffffffff],
+    }
+
+    def build_array(self, model: DatatypeBase, data) -> Block:
+        class Holder(Block):
+            first = U8()
+            array = Array(model)
+            last = U8()
+
+        return baf.build(Holder, {'first': 0xaa, 'array': data, 'last': 0xbb})
+
+    def check_primitives(self):
+        for model, values in self.cases.items():
+            with self.subTest(model=model.__name__):
+                block = self.build_array(model(), values)
+                array_bytes = expected_bytes(model, values)
+                self.assertEqual(block.get_bytes(), b'\xaa' + array_bytes + b'\xbb')
+                self.assertEqual(block.size(), len(array_bytes) + 2)
+                self.assertEqual(block.last.offset(), len(array_bytes) + 1)
+                self.assertEqual([int(item) for item in block.array.get_items()], values)
+                self.assertEqual(block.array.get_items()[2].offset(), 2 * model.static_size())
+
+    @unittest.skipIf(datatypes.np is None, "numpy is not installed")
+    def test_primitives_numpy(self):
+        block = self.build_array(I16(), [-1, 0xffff])
+        self.assertIsNotNone(block.array._values)
+        self.check_primitives()
+
+    def test_primitives_without_numpy(self):
+        with mock.patch.object(datatypes, 'np', None):
+            block = self.build_array(I16(), [-1, 0xffff])
+            self.assertIsNone(block.array._values)
+            self.check_primitives()
+
+    def test_bytes_input(self):
+        for model in (U8, S8, I8):
+            with self.subTest(model=model.__name__):
+                block = self.build_array(model(), b'\x00\x05\x7f')
+                self.assertEqual(block.get_bytes(), b'\xaa\x00\x05\x7f\xbb')
+                self.assertEqual([int(item) for item in block.array.get_items()], [0, 5, 0x7f])
+        block = self.build_array(U8(), bytearray(b'\x80\xff'))
+        self.assertEqual(block.get_bytes(), b'\xaa\x80\xff\xbb')
+
+    def test_bytes_input_out_of_range(self):
+        with self.assertRaises(ValidationError):
+            self.build_array(S8(), b'\x00\x80')
+
+    def test_out_of_range(self):
+        for use_numpy in (True, False):
+            with self.subTest(use_numpy=use_numpy), mock.patch.object(datatypes, 'np', datatypes.np if use_numpy else None):
+                with self.assertRaises(ValidationError):
+                    self.build_array(U16(), [1, 0x10000])
+                with self.assertRaises(ValidationError):
+                    self.build_array(S8(), [-0x81, 0])
+
+    def test_custom_get_bytes(self):
+        class Reversed(U16):
+            def _get_bytes(self):
+                return super()._get_bytes()[::-1]
+
+        block = self.build_array(Reversed(), [0x0102, 0x0304])
+        self.assertIsNone(block.array._values)
+        self.assertEqual(block.get_bytes(), bytes.fromhex('aa02010403bb'))
+
+
+class TestCustomDatatype(unittest.TestCase):
+
+    def test_init_without_super(self):
+        class Pad(GenDatatype):
+            def __init__(self, amount):
+                self.amount = amount
+
+            def size(self):
+                return self.amount
+
+            def _get_bytes(self):
+                return bytes(self.amount)
+
+        class Padded(Block):
+            a = U8()
+            pad = Pad(2)
+            b = U8()
+
+        block = baf.build(Padded, {'a': 1, 'b': 2})
+        self.assertEqual(block.get_bytes(), bytes([1, 0, 0, 2]))
+
+
+class TestOverriddenOutput(unittest.TestCase):
+
+    def test_get_bytes_longer_than_size(self):
+        class Tagged(Block):
+            a = U8()
+
+            def get_bytes(self):
+                return super().get_bytes() + b'E'
+
+        class Outer(Block):
+            tagged = Tagged()
+            b = U8()
+
+        block = baf.build(Outer, {'tagged': {'a': 1}, 'b': 2})
+        self.assertEqual(block.get_bytes(), bytes.fromhex('014502'))
+
+    def test_get_bytes_override_on_primitive(self):
+        class Doubled(U8):
+            def _get_bytes(self):
+                return super()._get_bytes() * 2
+
+        class Outer(Block):
+            a = Doubled()
+            b = Array(Doubled())
+
+        block = baf.build(Outer, {'a': 1, 'b': [2, 3]})
+        self.assertEqual(block.get_bytes(), bytes.fromhex('010102020303'))
+
+
+if __name__ == '__main__':
+    unittest.main()